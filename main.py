@@ -1,204 +1,410 @@
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Optional, Literal, Dict, Any
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from typing import List, Optional, Literal, Dict, Any, Union
+from itertools import cycle, islice
+import asyncio
 import math
-import statistics
 import os
+import msgspec
+import xxhash
+import numpy as np
+import pandas as pd
+from numba import njit
 import uvicorn
 
-app = FastAPI()
+# any future JSON routes serialize through orjson by default
+app = FastAPI(default_response_class=ORJSONResponse)
+# report HTML is full of repeated inline styles and compresses 5-10x;
+# modest level so compression never dominates the cached hot path
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # ─── Models ────────────────────────────────────────────────────────────────
 
-class ChartDefinition(BaseModel):
-    title: Optional[str] = ""
+# msgspec decodes the request body straight into these structs in one C
+# pass — no intermediate dicts and no per-row validation walk
+class ChartDefinition(msgspec.Struct):
     type: Literal["pie", "bar", "column", "line"]
     calculation: Literal["count", "sum", "average", "min", "max"]
-    field: str                  # field to calculate on (or count)
-    label_field: Optional[str]  # field to group by
+    field: str                          # field to calculate on (or count)
+    label_field: Optional[str] = None   # field to group by
+    title: Optional[str] = ""
     colors: Optional[List[str]] = None  # optional custom palette
 
-class LayoutDefinition(BaseModel):
+class LayoutDefinition(msgspec.Struct):
     columns: int
     charts: List[ChartDefinition]
 
-class ReportRequest(BaseModel):
-    data: List[Dict[str, Any]]
+class ReportRequest(msgspec.Struct):
+    # rows (list of records) or columns (field name -> list of values);
+    # columnar payloads skip the transpose in extract_columns entirely
+    data: Union[List[Dict[str, Any]], Dict[str, List[Any]]]
     layout: LayoutDefinition
 
 # ─── Aggregation ─────────────────────────────────────────────────────────
 
-def aggregate(data, chart: ChartDefinition) -> Dict[str, float]:
-    buckets: Dict[str, List[float]] = {}
-    for item in data:
-        key = item.get(chart.label_field) or "Unknown"
-        raw = item.get(chart.field, 0)
-        try:
-            val = float(raw)
-        except:
-            val = 0.0
-        buckets.setdefault(key, []).append(val)
-
-    result: Dict[str, float] = {}
-    for k, vals in buckets.items():
-        if chart.calculation == "count":
-            result[k] = len(vals)
-        elif chart.calculation == "sum":
-            result[k] = sum(vals)
-        elif chart.calculation == "average":
-            result[k] = statistics.mean(vals) if vals else 0
-        elif chart.calculation == "min":
-            result[k] = min(vals) if vals else 0
-        elif chart.calculation == "max":
-            result[k] = max(vals) if vals else 0
-    return result
+# one cached @njit kernel per calculation: no op dispatch inside the hot
+# loop, so each body is a straight-line reduction LLVM can vectorize
+@njit(cache=True)
+def _group_sum(codes, vals, ng):
+    out = np.zeros(ng)
+    for i in range(codes.size):
+        out[codes[i]] += vals[i]
+    return out
+
+@njit(cache=True)
+def _group_mean(codes, vals, ng):
+    out = np.zeros(ng)
+    cnt = np.zeros(ng, np.int64)
+    for i in range(codes.size):
+        c = codes[i]
+        out[c] += vals[i]
+        cnt[c] += 1
+    for g in range(ng):
+        out[g] = out[g] / cnt[g] if cnt[g] else 0.0
+    return out
+
+@njit(cache=True)
+def _group_min(codes, vals, ng):
+    out = np.full(ng, np.inf)
+    for i in range(codes.size):
+        c = codes[i]
+        v = vals[i]
+        out[c] = v if v < out[c] else out[c]
+    return out
+
+@njit(cache=True)
+def _group_max(codes, vals, ng):
+    out = np.full(ng, -np.inf)
+    for i in range(codes.size):
+        c = codes[i]
+        v = vals[i]
+        out[c] = v if v > out[c] else out[c]
+    return out
+
+_REDUCERS = {"sum": _group_sum, "average": _group_mean, "min": _group_min, "max": _group_max}
+
+def extract_columns(data, layout: LayoutDefinition) -> Dict[str, np.ndarray]:
+    # one pass over the rows per referenced field; every chart then works on
+    # these shared arrays instead of re-walking the list of dicts
+    fields = {c.field for c in layout.charts} | {c.label_field for c in layout.charts if c.label_field}
+    if isinstance(data, dict):
+        # columnar payload: the client already sent one list per field
+        return {f: np.asarray(data[f], dtype=object) for f in fields if f in data}
+    n = len(data)
+    return {f: np.fromiter((d.get(f) for d in data), dtype=object, count=n) for f in fields}
+
+def row_count(data) -> int:
+    if isinstance(data, dict):
+        return len(next(iter(data.values()), ()))
+    return len(data)
+
+# grouping and numeric-conversion intermediates keyed by (data hash, field):
+# charts sharing a label_field or value field reuse one O(N) pass instead of
+# each redoing it, both within a layout and across repeat requests
+_CACHE_MAX = 2048
+_GROUP_CACHE: Dict[tuple, tuple] = {}
+_VALUES_CACHE: Dict[tuple, np.ndarray] = {}
+
+def _cached(cache, key, make):
+    val = cache.get(key)
+    if val is None:
+        val = make()
+        if len(cache) >= _CACHE_MAX:
+            cache.clear()
+        cache[key] = val
+    return val
+
+def _numeric_values(cols, field, nrows: int, data_hash: int) -> np.ndarray:
+    def make():
+        # coerce non-numeric values to 0, matching the old float(...)-or-0 behaviour
+        col = cols.get(field)
+        if col is None:
+            return np.zeros(nrows)
+        return pd.to_numeric(pd.Series(col), errors="coerce").fillna(0.0).to_numpy(np.float64)
+    return _cached(_VALUES_CACHE, (data_hash, field), make)
+
+def _is_sorted(keys: np.ndarray) -> bool:
+    if keys.size < 2:
+        return True
+    try:
+        return bool((keys[1:] >= keys[:-1]).all())
+    except TypeError:  # mixed key types don't order; use the hash path
+        return False
+
+def _grouped(cols, label_field, nrows: int, data_hash: int) -> tuple:
+    # returns (sorted, bounds_or_codes, uniques): presorted keys yield group
+    # boundaries from a linear scan, anything else factorizes to int codes
+    def make():
+        keys = cols.get(label_field)
+        if keys is None:
+            return (False, np.zeros(nrows, dtype=np.intp), ["Unknown"])
+        # the original loop did `item.get(label_field) or "Unknown"`: all
+        # falsy labels ("" / 0 / False), not just missing ones, coalesce
+        keys = pd.Series(keys).fillna("Unknown")
+        keys = keys.where(keys.astype(bool), "Unknown").to_numpy()
+        if _is_sorted(keys):
+            bounds = np.r_[0, np.flatnonzero(keys[1:] != keys[:-1]) + 1]
+            return (True, bounds, keys[bounds].tolist())
+        codes, uniques = pd.factorize(keys, sort=False)
+        return (False, codes, uniques.tolist())
+    return _cached(_GROUP_CACHE, (data_hash, label_field), make)
+
+def _sorted_reduce(bounds, uniques, cols, nrows, chart, data_hash) -> Dict[str, float]:
+    calc = chart.calculation
+    if calc == "count":
+        return dict(zip(uniques, np.diff(np.r_[bounds, nrows]).tolist()))
+    vals = _numeric_values(cols, chart.field, nrows, data_hash)
+    if calc == "sum":
+        out = np.add.reduceat(vals, bounds)
+    elif calc == "min":
+        out = np.minimum.reduceat(vals, bounds)
+    elif calc == "max":
+        out = np.maximum.reduceat(vals, bounds)
+    else:
+        out = np.add.reduceat(vals, bounds) / np.diff(np.r_[bounds, nrows])
+    return dict(zip(uniques, out.tolist()))
+
+def aggregate(cols: Dict[str, np.ndarray], nrows: int, chart: ChartDefinition,
+              data_hash: int) -> Dict[str, float]:
+    if not nrows:
+        return {}
+    is_sorted, grouping, uniques = _grouped(cols, chart.label_field, nrows, data_hash)
+    if is_sorted:
+        return _sorted_reduce(grouping, uniques, cols, nrows, chart, data_hash)
+
+    if chart.calculation == "count":
+        return dict(zip(uniques, np.bincount(grouping, minlength=len(uniques)).tolist()))
+
+    vals = _numeric_values(cols, chart.field, nrows, data_hash)
+    out = _REDUCERS[chart.calculation](grouping, vals, len(uniques))
+    return dict(zip(uniques, out.tolist()))
 
 # ─── SVG Generators ────────────────────────────────────────────────────────
 
-DEFAULT_COLORS = ["#4CAF50","#FF9800","#2196F3","#F44336","#9C27B0"]
-
-def gen_pie_svg(agg: Dict[str, float], colors: List[str]) -> str:
-    total = sum(agg.values()) or 1
-    start = 0.0
-    parts = []
-    idx = 0
-    for label, val in agg.items():
-        frac = val / total
-        end = start + frac
-        large = 1 if frac >= .5 else 0
-        # coordinates on unit circle scaled to 100×100
-        x1 = 100 + 100*math.cos(2*math.pi*start)
-        y1 = 100 + 100*math.sin(2*math.pi*start)
-        x2 = 100 + 100*math.cos(2*math.pi*end)
-        y2 = 100 + 100*math.sin(2*math.pi*end)
-        color = colors[idx % len(colors)]
-        parts.append(
-            f'<path d="M100,100 L{x1:.2f},{y1:.2f} A100,100 0 {large},1 {x2:.2f},{y2:.2f} Z" fill="{color}" stroke="#fff"/>'
-        )
-        start = end
-        idx += 1
-    return f'<svg viewBox="0 0 200 200" width="200" height="200">{"".join(parts)}</svg>'
-
-def gen_bar_svg(agg: Dict[str, float], colors: List[str]) -> str:
-    maxv = max(agg.values()) or 1
-    parts = []
-    idx = 0
+DEFAULT_COLORS = [b"#4CAF50",b"#FF9800",b"#2196F3",b"#F44336",b"#9C27B0"]
+
+# single C-loop HTML escape (vs html.escape's five str.replace passes),
+# emitting utf-8 bytes ready for the bytes render pipeline
+_HTML_ESCAPE = str.maketrans({"&":"&amp;","<":"&lt;",">":"&gt;",'"':"&quot;","'":"&#39;"})
+
+def esc(label) -> bytes:
+    return str(label).translate(_HTML_ESCAPE).encode("utf-8")
+
+# row templates compiled once; %-formatting dispatches to one C call per row
+_PIE_SLICE  = b'<path d="M100,100 L%.2f,%.2f A100,100 0 %d,1 %.2f,%.2f Z" fill="%s" stroke="#fff"/>'
+_SVG_200    = b'<svg viewBox="0 0 200 200" width="200" height="200">'
+_BAR_RECT   = b'<rect x="0" y="%d" width="%.2f" height="20" fill="%s"/>'
+_BAR_TEXT   = b'<text x="%.2f" y="%d" font-size="12">%s: %.0f</text>'
+_BAR_OPEN   = b'<svg viewBox="0 0 300 %d" width="300" height="%d">'
+_COL_RECT   = b'<rect x="%d" y="%.2f" width="30" height="%.2f" fill="%s"/>'
+_COL_TEXT   = b'<text x="%d" y="170" font-size="12" text-anchor="middle">%s</text>'
+_COL_OPEN   = b'<svg viewBox="0 0 %d 200" width="%d" height="200">'
+_LINE_SEG   = b'<line x1="%.2f" y1="%.2f" x2="%.2f" y2="%.2f" stroke="%s" stroke-width="2"/>'
+_LINE_DOT   = b'<circle cx="%.2f" cy="%.2f" r="4" fill="%s"/>'
+_LINE_LABEL = b'<text x="%.2f" y="190" font-size="12" text-anchor="middle">%s</text>'
+_CHART_DIV  = (b'<div style="text-align:center; padding:10px;">'
+               b'<div style="font-size:18px; font-weight:bold; margin-bottom:8px;">%s</div>%s</div>')
+
+def gen_pie_svg(agg: Dict[str, float], colors: List[bytes]) -> bytes:
+    n = len(agg)
+    fracs = np.fromiter(agg.values(), dtype=np.float64, count=n)
+    fracs /= fracs.sum() or 1
+    # slice end points on the circle in two vectorized trig calls; start
+    # points are the previous slice's end points (angle 0 for the first)
+    angles = np.cumsum(fracs) * (2*math.pi)
+    xs = 100 + 100*np.cos(angles)
+    ys = 100 + 100*np.sin(angles)
+    x1s = np.roll(xs, 1)
+    y1s = np.roll(ys, 1)
+    if n:
+        x1s[0] = 200.0
+        y1s[0] = 100.0
+    large_arcs = (fracs >= .5).astype(np.int8)
+    palette = list(islice(cycle(colors), n))
+    buf = bytearray(_SVG_200)
+    for idx in range(n):
+        buf += _PIE_SLICE % (x1s[idx], y1s[idx], large_arcs[idx], xs[idx], ys[idx], palette[idx])
+    buf += b'</svg>'
+    return bytes(buf)
+
+def gen_bar_svg(agg: Dict[str, float], colors: List[bytes]) -> bytes:
+    n = len(agg)
+    vals = np.fromiter(agg.values(), dtype=np.float64, count=n)
+    maxv = (vals.max() if n else 0) or 1
+    # all bar widths in one SIMD multiply instead of a divide per row
+    ws = vals * (200.0/maxv)
+    palette = list(islice(cycle(colors), n))
+    buf = bytearray()
     y = 0
-    for label, val in agg.items():
-        w = (val/maxv)*200
-        color = colors[idx % len(colors)]
-        parts.append(f'<rect x="0" y="{y}" width="{w:.2f}" height="20" fill="{color}"/>')
-        parts.append(f'<text x="{w+5:.2f}" y="{y+15}" font-size="12">{label}: {val:.0f}</text>')
+    for idx, (label, val) in enumerate(agg.items()):
+        w = ws[idx]
+        buf += _BAR_RECT % (y, w, palette[idx])
+        buf += _BAR_TEXT % (w+5, y+15, esc(label), val)
         y += 30
-        idx += 1
     height = y
-    return f'<svg viewBox="0 0 300 {height}" width="300" height="{height}">' + "".join(parts) + '</svg>'
+    return _BAR_OPEN % (height, height) + bytes(buf) + b'</svg>'
 
-def gen_column_svg(agg: Dict[str, float], colors: List[str]) -> str:
-    maxv = max(agg.values()) or 1
-    parts = []
-    idx = 0
+def gen_column_svg(agg: Dict[str, float], colors: List[bytes]) -> bytes:
+    n = len(agg)
+    vals = np.fromiter(agg.values(), dtype=np.float64, count=n)
+    maxv = (vals.max() if n else 0) or 1
+    hs = vals * (150.0/maxv)
+    palette = list(islice(cycle(colors), n))
+    buf = bytearray()
     x = 0
-    for label, val in agg.items():
-        h = (val/maxv)*150
-        color = colors[idx % len(colors)]
-        parts.append(f'<rect x="{x}" y="{150-h:.2f}" width="30" height="{h:.2f}" fill="{color}"/>')
-        parts.append(f'<text x="{x+15}" y="170" font-size="12" text-anchor="middle">{label}</text>')
+    for idx, label in enumerate(agg.keys()):
+        h = hs[idx]
+        buf += _COL_RECT % (x, 150-h, h, palette[idx])
+        buf += _COL_TEXT % (x+15, esc(label))
         x += 50
-        idx += 1
     width = x
-    return f'<svg viewBox="0 0 {width} 200" width="{width}" height="200">' + "".join(parts) + '</svg>'
+    return _COL_OPEN % (width, width) + bytes(buf) + b'</svg>'
 
-def gen_line_svg(agg: Dict[str, float], colors: List[str]) -> str:
-    maxv = max(agg.values()) or 1
-    pts = []
-    idx = 0
+def gen_line_svg(agg: Dict[str, float], colors: List[bytes]) -> bytes:
     n = len(agg)
-    for label, val in agg.items():
-        x = 200 * idx/(n-1 if n>1 else 1)
-        y = 150 - (val/maxv)*150
-        pts.append((x,y))
-        idx += 1
+    vals = np.fromiter(agg.values(), dtype=np.float64, count=n)
+    maxv = (vals.max() if n else 0) or 1
+    c0 = colors[0]
+    # vectorized point coordinates: one multiply over the whole series
+    xstep = 200.0/(n-1) if n > 1 else 0.0
+    xs = np.arange(n) * xstep
+    ys = 150 - vals * (150.0/maxv)
+
+    labels = bytearray()
+    for i, label in enumerate(agg.keys()):
+        labels += _LINE_LABEL % (xs[i], esc(label))
 
     # lines + circles
-    line_parts = []
-    for i in range(len(pts)-1):
-        x1,y1 = pts[i]; x2,y2 = pts[i+1]
-        line_parts.append(f'<line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" stroke="{colors[0]}" stroke-width="2"/>')
-    for x,y in pts:
-        line_parts.append(f'<circle cx="{x:.2f}" cy="{y:.2f}" r="4" fill="{colors[0]}"/>')
-    # x labels
-    text_parts = []
-    idx=0
-    for label in agg.keys():
-        x = 200 * idx/(n-1 if n>1 else 1)
-        text_parts.append(f'<text x="{x:.2f}" y="190" font-size="12" text-anchor="middle">{label}</text>')
-        idx+=1
-
-    return (
-      f'<svg viewBox="0 0 200 200" width="200" height="200">'
-      + "".join(line_parts)
-      + "".join(text_parts)
-      + '</svg>'
-    )
+    buf = bytearray(_SVG_200)
+    for i in range(n-1):
+        buf += _LINE_SEG % (xs[i], ys[i], xs[i+1], ys[i+1], c0)
+    for i in range(n):
+        buf += _LINE_DOT % (xs[i], ys[i], c0)
+    buf += labels
+    buf += b'</svg>'
+    return bytes(buf)
 
 # ─── Chart → HTML ──────────────────────────────────────────────────────
 
-def render_chart(chart: ChartDefinition, data: List[Dict[str,Any]]) -> str:
-    agg = aggregate(data, chart)
-    colors = chart.colors or DEFAULT_COLORS
-
-    if chart.type == "pie":
-        svg = gen_pie_svg(agg, colors)
-    elif chart.type == "bar":
-        svg = gen_bar_svg(agg, colors)
-    elif chart.type == "column":
-        svg = gen_column_svg(agg, colors)
-    elif chart.type == "line":
-        svg = gen_line_svg(agg, colors)
-    else:
-        return "<div>Unsupported chart type</div>"
+# rendered chart fragments keyed by (data hash, chart definition); dashboards
+# re-render the same charts against unchanged data far more often than not
+_RENDER_CACHE: Dict[tuple, bytes] = {}
 
-    return f"""
-      <div style="text-align:center; padding:10px;">
-        <div style="font-size:18px; font-weight:bold; margin-bottom:8px;">{chart.title}</div>
-        {svg}
-      </div>
-    """
+def render_chart_cached(chart: ChartDefinition, cols: Dict[str, np.ndarray],
+                        nrows: int, data_hash: int) -> bytes:
+    key = (data_hash, chart.type, chart.calculation, chart.field,
+           chart.label_field, chart.title, tuple(chart.colors or ()))
+    return _cached(_RENDER_CACHE, key, lambda: render_chart(chart, cols, nrows, data_hash))
+
+# one hash lookup instead of an if/elif chain; new chart types register here
+_RENDERERS = {
+    "pie": gen_pie_svg,
+    "bar": gen_bar_svg,
+    "column": gen_column_svg,
+    "line": gen_line_svg,
+}
+
+def render_chart(chart: ChartDefinition, cols: Dict[str, np.ndarray], nrows: int,
+                 data_hash: int) -> bytes:
+    gen = _RENDERERS.get(chart.type)
+    if gen is None:
+        return b"<div>Unsupported chart type</div>"
+    agg = aggregate(cols, nrows, chart, data_hash)
+    colors = [c.encode("utf-8") for c in chart.colors] if chart.colors else DEFAULT_COLORS
+    return _CHART_DIV % (esc(chart.title or ""), gen(agg, colors))
 
 # ─── Endpoint ──────────────────────────────────────────────────────────
 
-@app.post("/render", response_class=HTMLResponse)
-async def render_report(req: ReportRequest):
-    html_blocks = []
-    for chart in req.layout.charts:
-        html_blocks.append(render_chart(chart, req.data))
-
-    # build table rows/cols
-    rows = []
-    for i in range(0, len(html_blocks), req.layout.columns):
-        slice_ = html_blocks[i:i+req.layout.columns]
-        cells = "".join(f'<td style="vertical-align:top; border:1px solid #eee; padding:10px;">{b}</td>' for b in slice_)
-        # pad
-        if len(slice_) < req.layout.columns:
-            cells += "<td></td>"*(req.layout.columns-len(slice_))
-        rows.append(f"<tr>{cells}</tr>")
-
-    table = "<table style='width:100%; border-collapse:collapse;'>"+ "".join(rows) + "</table>"
-
-    html = f"""
+# static chrome built once at import, pre-encoded so the response is
+# assembled as bytes and HTMLResponse skips its str->utf-8 encode pass
+_HEAD = b"""
     <html><head>
       <style>
-        body {{ font-family:Arial,sans-serif; background:#f9f9f9; padding:20px; }}
-        table {{ background:white; }}
+        body { font-family:Arial,sans-serif; background:#f9f9f9; padding:20px; }
+        .cell { background:white; border:1px solid #eee; padding:10px; }
       </style>
     </head><body>
-      {table}
-    </body></html>
     """
-    return HTMLResponse(content=html)
+_TAIL = b"</body></html>"
+# the browser lays out the grid; no server-side row chunking or padding
+_GRID_OPEN = b'<div style="display:grid;grid-template-columns:repeat(%d,1fr);gap:10px">'
+_CELL = b'<div class="cell">%s</div>'
+
+# finished reports keyed by body hash; a repeat request is a dict lookup
+_RESPONSE_CACHE: Dict[str, bytes] = {}
+
+def _prepare(body: bytes):
+    # decode + validate the raw body with msgspec in a single C pass; the
+    # data rows are transposed straight into per-field columns
+    try:
+        req = msgspec.json.decode(body, type=ReportRequest)
+    except msgspec.DecodeError as e:  # malformed JSON or schema violation
+        raise HTTPException(status_code=422, detail=str(e))
+    cols = extract_columns(req.data, req.layout)
+    nrows = row_count(req.data)
+    # columnar payloads can ship ragged columns; the reduction kernels index
+    # codes and values in lockstep, so reject mismatches before rendering
+    for f, col in cols.items():
+        if len(col) != nrows:
+            raise HTTPException(status_code=422,
+                                detail=f"column '{f}' has {len(col)} values, expected {nrows}")
+    data_hash = xxhash.xxh3_64_intdigest(msgspec.json.encode(req.data))
+    return req.layout, cols, nrows, data_hash
+
+@app.post("/render")
+async def render_report(request: Request):
+    body = await request.body()
+    etag = xxhash.xxh3_64_hexdigest(body)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    cached = _RESPONSE_CACHE.get(etag)
+    if cached is not None:
+        return HTMLResponse(cached, headers={"ETag": etag})
+
+    # decode/transpose/hash are pure CPU work — run them on the threadpool
+    # so the event loop keeps accepting other connections
+    layout, cols, nrows, data_hash = await asyncio.to_thread(_prepare, body)
+
+    # all charts render in parallel on the threadpool; awaiting the first one
+    # before the response starts means a predictable render failure becomes an
+    # error status rather than a silently truncated 200 mid-stream
+    tasks = [asyncio.create_task(asyncio.to_thread(render_chart_cached, c, cols, nrows, data_hash))
+             for c in layout.charts]
+    if tasks:
+        try:
+            await tasks[0]
+        except Exception:
+            for t in tasks[1:]:
+                t.cancel()
+            raise
+
+    async def stream():
+        # remaining cells are awaited and flushed in order as results land
+        buf = bytearray(_HEAD)
+        yield _HEAD
+        grid = _GRID_OPEN % layout.columns
+        buf += grid
+        yield grid
+        for t in tasks:
+            cell = _CELL % await t
+            buf += cell
+            yield cell
+        buf += b"</div>"
+        yield b"</div>"
+        buf += _TAIL
+        yield _TAIL
+        # stash the finished report for repeat requests
+        if len(_RESPONSE_CACHE) >= _CACHE_MAX:
+            _RESPONSE_CACHE.clear()
+        _RESPONSE_CACHE[etag] = bytes(buf)
+
+    return StreamingResponse(stream(), media_type="text/html", headers={"ETag": etag})
 
 if __name__=="__main__":
     port=int(os.environ.get("PORT",8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port)
+    dev = os.environ.get("DEV") == "1"
+    uvicorn.run("main:app", host="0.0.0.0", port=port,
+                loop="uvloop", http="httptools",
+                workers=1 if dev else int(os.environ.get("WORKERS", os.cpu_count() or 1)),
+                reload=dev)